@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+
+#measures how long PyBonsai takes to start and fails (exit code 1) if it is over budget
+#times are measured relative to starting a bare interpreter, so the budget does not depend on how fast the machine starts Python
+#
+#   python benchmark_startup.py                        (runs from the source in this repository)
+#   python benchmark_startup.py dist/pybonsai.pyz      (runs a zipapp built with build_zipapp.py)
+
+
+import sys
+import subprocess
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+
+ROOT = Path(__file__).resolve().parent
+
+RUNS = 20
+
+#maximum time (in seconds) on top of the bare interpreter
+STARTUP_BUDGET = 0.05  #pybonsai --version
+RENDER_BUDGET = 0.5  #pybonsai --instant (default sized tree)
+
+
+def time_command(command):
+    times = []
+    for _ in range(RUNS):
+        start_time = perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        times.append(perf_counter() - start_time)
+
+    return median(times)
+
+
+def main():
+    if len(sys.argv) > 1:
+        pybonsai = [sys.executable, sys.argv[1]]
+    else:
+        pybonsai = [sys.executable, "-m", "pybonsai"]
+
+    baseline = time_command([sys.executable, "-c", "pass"])
+
+    checks = [
+        ("startup", pybonsai + ["--version"], STARTUP_BUDGET),
+        ("render", pybonsai + ["--instant", "--seed", "1", "--width", "80", "--height", "25"], RENDER_BUDGET)
+    ]
+
+    passed = True
+    for name, command, budget in checks:
+        overhead = time_command(command) - baseline
+        within_budget = overhead <= budget
+
+        print(f"{name}: {overhead * 1000:.1f}ms over the interpreter (budget {budget * 1000:.0f}ms) {'ok' if within_budget else 'OVER BUDGET'}")
+
+        passed = passed and within_budget
+
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+
+#builds PyBonsai into a single file zipapp (dist/pybonsai.pyz) that includes precompiled bytecode, so it starts quickly
+#the bytecode is only used by the same Python version that built it (other versions fall back to compiling the source)
+#
+#   python build_zipapp.py
+#   ./dist/pybonsai.pyz --version
+
+
+import shutil
+import zipapp
+import compileall
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent
+OUTPUT = ROOT / "dist" / "pybonsai.pyz"
+
+
+def main():
+    with tempfile.TemporaryDirectory() as staging:
+        package = Path(staging) / "pybonsai"
+        shutil.copytree(ROOT / "pybonsai", package, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+
+        #zipimport only loads bytecode stored next to the source (not in __pycache__), so use the legacy layout
+        compileall.compile_dir(package, quiet=1, legacy=True)
+
+        OUTPUT.parent.mkdir(exist_ok=True)
+        zipapp.create_archive(staging, OUTPUT, interpreter="/usr/bin/env python3", main="pybonsai.main:main")
+
+    print(f"Built {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
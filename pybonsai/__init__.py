@@ -0,0 +1,54 @@
+#library interface for PyBonsai: render trees from another Python program without running pybonsai and parsing its output
+#
+#   import pybonsai
+#
+#   frame = pybonsai.render(seed=42)
+#   frame.chars[row, col]  => unicode code point of the cell
+#   frame.colours[row, col, 0]  => red value of the cell (green and blue are at 1 and 2)
+#   print(frame.to_ansi())
+
+
+from . import main
+
+import copy
+
+
+class Frame:
+    #a finished tree. The planes are memoryviews onto the window's framebuffer, so reading them does not copy anything
+    def __init__(self, buffer):
+        buffer = buffer.to_dense()  #no copy is made unless the window used a sparse buffer
+
+        self.buffer = buffer
+
+        self.width = buffer.width
+        self.height = buffer.height
+
+        shape = (buffer.height, buffer.width)
+
+        self.chars = memoryview(buffer.chars).cast("B").cast("I", shape)
+        self.colours = memoryview(buffer.colours).cast("B", shape + (3,))
+        self.filled = memoryview(buffer.filled).cast("B", shape)
+
+    def to_ansi(self):
+        #encode the frame as ANSI coloured text (this is only needed to print the frame in a terminal)
+        return "\n".join(self.buffer.encode())
+
+
+def render(options=None, seed=None):
+    #grow a tree and return the finished Frame. options is a pybonsai.main.Options (the defaults are used if it is None)
+    #work on a copy, so the caller's options are left as they were (e.g. not switched to instant mode, or given a tree type)
+    options = copy.copy(options) if options is not None else main.Options()
+
+    options.instant = True  #a library caller only wants the finished tree
+
+    if seed is not None:
+        options.set_seed(seed)
+
+    options.finalise()
+
+    window = main.get_window(options)
+
+    t = main.get_tree(window, options)
+    t.draw()
+
+    return Frame(window.buffer)
@@ -0,0 +1,5 @@
+#allows PyBonsai to be run with python -m pybonsai (and as a zipapp)
+from .main import main
+
+
+main()
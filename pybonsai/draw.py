@@ -0,0 +1,547 @@
+import math
+from . import utils
+import random
+import sys
+from array import array
+from os import get_terminal_size
+from time import sleep, perf_counter
+
+
+#ANSI escape codes (https://en.wikipedia.org/wiki/ANSI_escape_code)
+END_COLOUR = "\033[00m"
+HIDE_CURSOR = "\033[?25l"  #not supported in all terminals
+SHOW_CURSOR = "\033[?25h"  #not supported in all terminals
+CLEAR_SCREEN = "\033[H\033[J"
+
+RESIZE_POLL_TIME = 0.05
+
+SPARSE_FILL_RATIO = 0.1  #use a SparseBuffer if the tree is expected to fill less than this fraction of the window
+
+CHAR_THRESHOLD = 0.3
+CHAR_THRESHOLD_VALUE = math.ceil(CHAR_THRESHOLD * 2**32)  #BulkRandom.next_value() < this exactly when uniform(0, 1) < CHAR_THRESHOLD
+
+
+colour_char = lambda char, r, g, b: f"\033[38;2;{r};{g};{b}m{char}{END_COLOUR}"  #ANSI escape code for 24 bit true colour (which most modern terminals support)
+
+
+class FrameBuffer:
+    #the cells of a window, stored row by row in flat arrays (one for the characters, one for the colours)
+    #the arrays support the buffer protocol, so other programs can read them without copying
+    BACKGROUND_CHAR = " "
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+        self.chars = array("I", [ord(FrameBuffer.BACKGROUND_CHAR)]) * (width * height)  #unicode code point of each cell
+        self.colours = bytearray(width * height * 3)  #rgb colour of each cell
+        self.filled = bytearray(width * height)  #1 if the cell has been set, 0 if it is still background
+
+        self.encoded_rows = [None for _ in range(height)]  #cache of each row as an ANSI string (None if it has changed)
+
+    def clear(self):
+        self.chars[:] = array("I", [ord(FrameBuffer.BACKGROUND_CHAR)]) * (self.width * self.height)
+        self.colours[:] = bytes(len(self.colours))
+        self.filled[:] = bytes(len(self.filled))
+
+        self.encoded_rows = [None for _ in range(self.height)]
+
+    def add_rows(self, num_rows):
+        #add rows at the top of the buffer
+        size = num_rows * self.width
+
+        self.chars[0:0] = array("I", [ord(FrameBuffer.BACKGROUND_CHAR)]) * size
+        self.colours[0:0] = bytes(size * 3)
+        self.filled[0:0] = bytes(size)
+
+        self.encoded_rows[0:0] = [None for _ in range(num_rows)]
+        self.height += num_rows
+
+    def remove_rows(self, num_rows):
+        #remove rows from the top of the buffer
+        size = num_rows * self.width
+
+        del self.chars[:size]
+        del self.colours[:size * 3]
+        del self.filled[:size]
+
+        del self.encoded_rows[:num_rows]
+        self.height -= num_rows
+
+    def set(self, x, y, char, colour):
+        inx = x * self.width + y
+
+        self.chars[inx] = ord(char)
+        self.colours[inx * 3 : inx * 3 + 3] = bytes(colour)
+        self.filled[inx] = 1
+
+        self.encoded_rows[x] = None
+
+    def encode_row(self, x):
+        if self.encoded_rows[x] is None:
+            start = x * self.width
+
+            cells = []
+            for inx in range(start, start + self.width):
+                char = chr(self.chars[inx])
+
+                if self.filled[inx]:
+                    r, g, b = self.colours[inx * 3 : inx * 3 + 3]
+                    char = colour_char(char, r, g, b)
+
+                cells.append(char)
+
+            self.encoded_rows[x] = "".join(cells)
+
+        return self.encoded_rows[x]
+
+    def encode(self):
+        return [self.encode_row(x) for x in range(self.height)]
+
+    def to_dense(self):
+        return self
+
+
+class SparseBuffer:
+    #alternative to FrameBuffer for big, mostly empty windows: only the cells that have been set are stored
+    #cells are stored per row, and rows are indexed up from the bottom so adding rows at the top does not move anything
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+        self.rows = {}  #rows up from the bottom => {column : (char, colour)}
+        self.encoded_rows = {}  #cache of each row as an ANSI string (removed if it has changed)
+
+        self.blank_row = FrameBuffer.BACKGROUND_CHAR * width
+
+    def clear(self):
+        self.rows.clear()
+        self.encoded_rows.clear()
+
+    def add_rows(self, num_rows):
+        self.height += num_rows
+
+    def remove_rows(self, num_rows):
+        self.height -= num_rows
+
+        for row in [row for row in self.rows if row >= self.height]:
+            del self.rows[row]
+            self.encoded_rows.pop(row, None)
+
+    def set(self, x, y, char, colour):
+        row = self.height - 1 - x
+
+        if row not in self.rows:
+            self.rows[row] = {}
+
+        self.rows[row][y] = (char, colour)
+        self.encoded_rows.pop(row, None)
+
+    def encode_row(self, x):
+        row = self.height - 1 - x
+
+        if row not in self.rows:
+            return self.blank_row
+
+        if row not in self.encoded_rows:
+            parts = []
+            next_y = 0
+
+            for y in sorted(self.rows[row]):
+                char, colour = self.rows[row][y]
+
+                parts.append(FrameBuffer.BACKGROUND_CHAR * (y - next_y))
+                parts.append(colour_char(char, colour[0], colour[1], colour[2]))
+
+                next_y = y + 1
+
+            parts.append(FrameBuffer.BACKGROUND_CHAR * (self.width - next_y))
+
+            self.encoded_rows[row] = "".join(parts)
+
+        return self.encoded_rows[row]
+
+    def encode(self):
+        return [self.encode_row(x) for x in range(self.height)]
+
+    def to_dense(self):
+        #copy the cells into a FrameBuffer (e.g. for pybonsai.Frame, which needs flat arrays)
+        buffer = FrameBuffer(self.width, self.height)
+
+        for row, cells in self.rows.items():
+            for y, (char, colour) in cells.items():
+                buffer.set(self.height - 1 - row, y, char, colour)
+
+        return buffer
+
+
+class TerminalWindow:
+    CHAR_WIDTH = 1
+    CHAR_HEIGHT = 2
+
+    def __init__(self, width, height, options, sparse=False, grows_trees=True):
+        #size of the window on screen (changes when the terminal is resized)
+        self.width = width
+        self.height = height
+
+        #size the tree is laid out in: this only changes when the tree grows off the top, so a resize never moves a tree while it grows
+        self.layout_width = width
+        self.layout_height = height
+
+        self.options = options
+
+        self.initial_height = height
+
+        self.buffer_type = SparseBuffer if sparse else FrameBuffer
+        self.buffer = self.buffer_type(width, height)
+
+        #every cell the tree has set, so it can be re-rendered at a different size without being regenerated
+        #keys are (rows up from the bottom, column the tree was laid out with) so they do not change when the window grows
+        self.cells = {}
+        self.col_shift = 0  #offset from the tree's columns to the window's columns (changes when the window is resized)
+
+        self.resize_pending = False
+
+        self.recorder = None  #record.Recorder if the cells set should be recorded (--record)
+        self.writer = None  #writer.FrameWriter if the window is drawn by another thread (--writer-thread)
+
+        #used for the per cell choices of branches and leaves. Only seeded for windows that trees are grown in (not e.g. the
+        #writer thread's copy), as seeding it draws from the global generator, which would change the tree grown for a given seed
+        self.rng = utils.BulkRandom(random.getrandbits(64)) if grows_trees else None
+
+        self.leaf_sprites = None  #tree.LeafSprites used by the trees drawn in this window (--leaf-pool), made when first needed
+
+        #counters for the time spent building and writing frames
+        self.num_frames = 0
+        self.total_frame_time = 0
+
+    def extract_colour(self, coloured_char):
+        #get the rgb colour from an ANSI coloured character
+        splitted = coloured_char.split(";")
+
+        r = int(splitted[2])
+        g = int(splitted[3])
+
+        b = ""
+        for i in splitted[4]:
+            if i == "m":
+                break
+            else:
+                b += i
+
+        b = int(b)
+
+        return r, g, b
+
+    def clear_chars(self):
+        #clear the existing buffer rather than allocating a new one, so it can be reused for many trees
+        self.buffer.clear()
+
+    def reset(self):
+        #get ready to draw a new tree in the same window
+        delta_height = self.height - self.initial_height
+
+        if delta_height > 0:
+            #the window grew for the last tree, so shrink it back and clear the extra lines from the screen
+            self.buffer.remove_rows(delta_height)
+            self.height = self.initial_height
+
+            sys.stdout.write(f"\033[J\033[{delta_height}B")
+
+        self.clear_chars()
+
+        self.cells.clear()
+        self.col_shift = 0
+
+        #lay the next tree out at the current size of the window
+        self.layout_width = self.width
+        self.layout_height = self.height
+
+    def on_resize(self, signum, frame):
+        #SIGWINCH handler: just note the resize, the window is re-rendered between frames
+        self.resize_pending = True
+
+    def check_resize(self):
+        if not self.resize_pending:
+            return False
+
+        self.resize_pending = False
+
+        term_width, term_height = get_terminal_size()
+        self.resize(min(term_width, self.options.window_width), min(term_height, self.options.window_height))
+
+        sys.stdout.write(CLEAR_SCREEN)  #the old frame will have been reflowed by the terminal, so start again at the top
+
+        return True
+
+    def resize(self, width, height):
+        #re-render the current tree at a new size from the cached cells (the tree is kept centred and on the bottom row)
+        #only the window on screen changes: a tree that is still growing keeps its layout, and its new cells are mapped the same way
+        self.col_shift += width // 2 - self.width // 2
+
+        self.width = width
+        self.initial_height = height
+
+        if not self.options.fixed_window and len(self.cells) > 0:
+            height = max(height, max(row for row, _ in self.cells) + 1)
+
+        self.height = height
+        self.buffer = self.buffer_type(width, height)
+
+        for (row, col), (char, colour) in self.cells.items():
+            self.show_cell(row, col, char, colour)
+
+    def hold(self, hold_time):
+        #wait with the current frame on screen, redrawing it straight away if the terminal is resized
+        end_time = perf_counter() + hold_time
+
+        while (remaining := end_time - perf_counter()) > 0:
+            sleep(min(remaining, RESIZE_POLL_TIME))
+
+            if self.check_resize():
+                self.draw()
+
+    def draw(self):
+        start_time = perf_counter()
+
+        #build the whole frame before writing it, so it is never seen half drawn
+        frame = [HIDE_CURSOR]
+
+        for row in self.buffer.encode():
+            frame.append(row)
+            frame.append("\n")
+
+        frame.append(f"\033[{self.height}A")  #move cursor to the top after we have finished
+        frame.append(SHOW_CURSOR)
+
+        sys.stdout.write("".join(frame))
+        sys.stdout.flush()
+
+        self.num_frames += 1
+        self.total_frame_time += perf_counter() - start_time
+
+        self.needs_clear = True
+
+    def reset_cursor(self):
+        #cursor will have been left at the top from drawing, so we need to place it back at the bottom
+        print(f"\033[{self.height}B", end="")
+
+    def plane_to_screen(self, x, y):
+        #convert cartesian coords to array indices
+        scaled_x = x / TerminalWindow.CHAR_WIDTH
+        scaled_y = y / TerminalWindow.CHAR_HEIGHT
+
+        inx1 = round(self.layout_height - scaled_y)
+        inx2 = round(scaled_x)
+
+        return inx1, inx2
+    
+    def screen_to_plane(self, x, y):
+        #convert array indices to cartesian coords (inverse of plane_to_screen())
+        swapped_x = y
+        swapped_y = self.layout_height - x
+
+        scaled_x = swapped_x * TerminalWindow.CHAR_WIDTH
+        scaled_y = swapped_y * TerminalWindow.CHAR_HEIGHT
+
+        return scaled_x, scaled_y
+    
+    def increase_height(self, delta_height):
+        if self.options.fixed_window:
+            return False
+        
+        self.layout_height += delta_height
+
+        if self.height < self.layout_height:
+            #the window may already be taller than the layout if the terminal has been resized
+            self.buffer.add_rows(self.layout_height - self.height)
+            self.height = self.layout_height
+
+        return True
+
+    def set_char_instant(self, x, y, char, colour, is_screen_coords):
+        if not is_screen_coords:
+            x, y = self.plane_to_screen(x, y)
+
+        #check the point will fit
+        if x < 0:
+            height_changed = self.increase_height(abs(x))
+
+            if height_changed:
+                x = 0
+
+        row = self.layout_height - 1 - x
+
+        self.cells[(row, y)] = (char, colour)
+
+        if self.recorder is not None:
+            self.recorder.add(row, y, char, colour)
+
+        if self.writer is not None:
+            self.writer.push(row, y, char, colour)
+
+        self.show_cell(row, y, char, colour)
+
+    def show_cell(self, row, col, char, colour):
+        #map a cell of the tree's layout (rows up from the bottom, tree column) onto the window on screen
+        x = self.height - 1 - row
+        y = col + self.col_shift
+
+        if 0 <= x < self.height and 0 <= y < self.width:
+            self.buffer.set(x, y, char, colour)
+
+    def set_char_wait(self, x, y, char, colour, is_screen_coords, wait_time):
+        #in non instant mode, we want to draw each new character after it is set
+        self.set_char_instant(x, y, char, colour, is_screen_coords)
+
+        if self.recorder is not None:
+            #the animation is being recorded rather than shown
+            self.recorder.end_frame()
+            return
+
+        if self.writer is not None:
+            #the writer thread draws the frames
+            self.writer.end_frame()
+            return
+
+        self.check_resize()
+        self.draw()
+        sleep(wait_time)
+
+    def get_line_char(self, line):
+        theta = line.get_theta()
+
+        upper = math.pi / 2 * (2 / 3)
+        lower = math.pi / 2 * (1 / 3)
+
+        if abs(theta) > upper:
+            return "|"
+        elif abs(theta) < lower:
+            return "_"
+        elif theta > 0:
+            return "/"
+        else:
+            return "\\"
+        
+    def choose_colour(self, colour):
+        if type(colour[0]) == int:
+            #the colour is not a range, so no choice must be made
+            return colour
+        elif len(colour[0]) == 2:
+            #colour should be random with rgb values in the given range
+            rand_colour = []
+            for lower, upper in colour:
+                value = self.rng.randint(lower, upper)
+                rand_colour.append(value)
+
+            return rand_colour
+        else:
+            raise Exception("Invalid colour argument")
+        
+    def get_candidate_cells(self, centre, width, size):
+        #only the cells within width + 1 of the mid line can be among the closest, so there is no need to check the whole row
+        #(every cell outside this range has at least width + 1 cells strictly closer, so the result is the same as checking all cells)
+        if not math.isfinite(centre):
+            return range(size)
+
+        centre = min(max(round(centre), 0), size - 1)
+
+        lower = max(0, centre - width - 1)
+        upper = min(size, centre + width + 2)
+
+        return range(lower, upper)
+
+    def draw_steep_line(self, start, end, colour, width, char, mid_line):
+        start_inx, _ = self.plane_to_screen(*start)
+        end_inx, _ = self.plane_to_screen(*end)
+
+        step = 1 if end_inx > start_inx else -1
+
+        for inx1 in range(start_inx, end_inx + step, step):
+            _, y = self.screen_to_plane(inx1, 0)
+            desired_x = mid_line.get_x(y)
+
+            dists = []
+            #get the distance away from the mid line for each cell near the line
+            for inx2 in self.get_candidate_cells(desired_x / TerminalWindow.CHAR_WIDTH, width, self.layout_width):
+                x, y = self.screen_to_plane(inx1, inx2)
+                dist = abs(desired_x - x)
+
+                dists.append([dist, inx2])
+                
+            #draw the n closest cells (n = width)
+            dists.sort()
+            for i in range(width):
+                if i >= len(dists):
+                    break
+
+                if self.rng.next_value() < CHAR_THRESHOLD_VALUE:
+                    chosen_char = self.rng.choice(self.options.branch_chars)
+                else:
+                    chosen_char = char
+
+                chosen_colour = self.choose_colour(colour)
+
+                if self.options.instant:
+                    self.set_char_instant(inx1, dists[i][1], chosen_char, chosen_colour, True)
+                else:
+                    self.set_char_wait(inx1, dists[i][1], chosen_char, chosen_colour, True, self.options.wait_time)
+
+    def draw_shallow_line(self, start, end, colour, width, char, mid_line):
+        _, start_inx = self.plane_to_screen(*start)
+        _, end_inx = self.plane_to_screen(*end)
+
+        step = 1 if end_inx > start_inx else -1
+
+        for inx2 in range(start_inx, end_inx + step, step):
+            x, _ = self.screen_to_plane(0, inx2)
+            desired_y = mid_line.get_y(x)
+
+            dists = []
+            #get the distance away from the mid line for each cell near the line
+            for inx1 in self.get_candidate_cells(self.layout_height - desired_y / TerminalWindow.CHAR_HEIGHT, width, self.layout_height):
+                x, y = self.screen_to_plane(inx1, inx2)
+                dist = abs(desired_y - y)
+
+                dists.append([dist, inx1])
+                
+            #draw the n closest cells (n = width)
+            dists.sort()
+            for i in range(width):
+                if i >= len(dists):
+                    break
+
+                if self.rng.next_value() < CHAR_THRESHOLD_VALUE:
+                    chosen_char = self.rng.choice(self.options.branch_chars)
+                else:
+                    chosen_char = char
+
+                chosen_colour = self.choose_colour(colour)
+
+                if self.options.instant:
+                    self.set_char_instant(dists[i][1], inx2, chosen_char, chosen_colour, True)
+                else:
+                    self.set_char_wait(dists[i][1], inx2, chosen_char, chosen_colour, True, self.options.wait_time)
+
+    def check_line_bounds(self, start, end):
+        #if the line will not fit in the current window, update the window size so that it willoptions
+        h1, _ = self.plane_to_screen(*start)
+        h2, _ = self.plane_to_screen(*end)
+
+        room_from_top = min(h1, h2)
+
+        if room_from_top < 0:
+            self.increase_height(abs(room_from_top))
+    
+    def draw_line(self, start, end, colour, width):
+        mid_line = utils.Line()
+        mid_line.set_end_points(start, end)
+
+        char = self.get_line_char(mid_line)
+
+        self.check_line_bounds(start, end)
+
+        if mid_line.is_vertical or abs(mid_line.m) >= 1:
+            self.draw_steep_line(start, end, colour, width, char, mid_line)
+        else:
+            self.draw_shallow_line(start, end, colour, width, char, mid_line)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import random
+
+
+FIRST_TREE_TYPE = 4  #--type of the first species in SPECIES (the types below are the recursive trees in tree.py)
+
+#turtle commands (any other symbol is only used by the grammar and does nothing when drawn)
+FORWARD = "F"
+TURN_RIGHT = "+"
+TURN_LEFT = "-"
+PUSH = "["
+POP = "]"
+
+
+#tree species as data: each rule maps a symbol to the string (or one of a list of strings, chosen at random) that replaces it
+#len_scale is how much shorter each F gets per iteration (as the rules make the tree longer), and leaf_symbols draw leaves
+SPECIES = [
+    {
+        "name" : "fractal plant",
+        "axiom" : "X",
+        "rules" : {
+            "X" : ["F+[[X]-X]-F[-FX]+X", "F-[[X]+X]+F[+FX]-X"],
+            "F" : "FF"
+        },
+        "iterations" : 4,
+        "angle" : 25,
+        "len_scale" : 0.5,
+        "leaf_symbols" : "X"
+    },
+    {
+        "name" : "bush",
+        "axiom" : "F",
+        "rules" : {
+            "F" : ["FF-[-F+F+FL]+[+F-F-FL]", "FF+[+F-F-FL]-[-F+F+FL]"]
+        },
+        "iterations" : 3,
+        "angle" : 22,
+        "len_scale" : 0.5,
+        "leaf_symbols" : "L"
+    }
+]
+
+
+class LSystem:
+    #expands an L-system grammar lazily: symbols are generated one at a time and the expanded string is never stored
+    #memory use is O(iterations), however long the expanded string would be
+    def __init__(self, axiom, rules, iterations):
+        self.axiom = axiom
+        self.rules = rules
+        self.iterations = iterations
+
+    def get_replacement(self, symbol):
+        replacement = self.rules[symbol]
+
+        if isinstance(replacement, str):
+            return replacement
+        else:
+            return random.choice(replacement)
+
+    def expand(self):
+        return self.expand_symbols(self.axiom, self.iterations)
+
+    def expand_symbols(self, symbols, depth):
+        for symbol in symbols:
+            if depth == 0 or symbol not in self.rules:
+                yield symbol
+            else:
+                yield from self.expand_symbols(self.get_replacement(symbol), depth - 1)
+
+    def count_symbols(self):
+        #expected number of each symbol in the expanded string, found without expanding it
+        counts = {}
+        for symbol in self.axiom:
+            counts[symbol] = counts.get(symbol, 0) + 1
+
+        for _ in range(self.iterations):
+            new_counts = {}
+
+            for symbol, count in counts.items():
+                if symbol not in self.rules:
+                    new_counts[symbol] = new_counts.get(symbol, 0) + count
+                    continue
+
+                replacements = self.rules[symbol]
+                if isinstance(replacements, str):
+                    replacements = [replacements]
+
+                for replacement in replacements:
+                    for new_symbol in replacement:
+                        new_counts[new_symbol] = new_counts.get(new_symbol, 0) + count / len(replacements)
+
+            counts = new_counts
+
+        return counts
+
+
+def get_lsystem(species, options):
+    #-l/--layers can reduce the number of iterations for a species, but not increase it
+    iterations = min(species["iterations"], options.num_layers)
+
+    return LSystem(species["axiom"], species["rules"], iterations)
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+
+
+#   
+#                #&                                  
+#              %&@&                                  
+#       &%@% %&  %@|                                 
+#    &&@@&%#@%_\@@&&@#       @=&                     
+#   &#@# #%##  ;&@%#  %@    @% &%                    
+#     @  %  #&  %%~|       @%@%@&#                   
+#                  |;;         # %                   
+#                     \\        @ % %@%#             
+#                      |~     =;@ __%%               
+#                      =|   ~_=___  %&#              
+#                      || /~         % #             
+#                      |//           &               
+#                      |=                            
+#                      ~|                            
+#                      ;|                            
+#       .---.        ./||\.    .-.     
+#   
+#       I speak for the trees, for the trees have no voice.
+#       - The Lorax, 1971
+#   
+
+
+from . import lsystem
+
+#the modules needed to grow and draw a tree (draw, tree, record, writer) are imported when they are first used,
+#so --help, --version and --replay start quickly
+
+import copy
+import random
+from sys import argv
+from math import radians
+from os import get_terminal_size
+from time import perf_counter
+
+
+VERSION = "1.2.2"
+DESC = "PyBonsai procedurally generates ASCII art trees in your terminal."
+
+
+class Options:
+    #stores all parameters that can be edited via the command line arguments
+    
+    #default values
+    NUM_LAYERS = 8
+    INITIAL_LEN = 15
+    ANGLE_MEAN = 40
+
+    LEAF_LEN = 4
+    LEAF_POOL = 0
+    LEAF_REUSE = 0
+
+    INSTANT = False
+    WAIT_TIME = 0
+
+    BRANCH_CHARS = "~;:="
+    LEAF_CHARS = "&%#@"
+
+    WINDOW_WIDTH = 80
+    WINDOW_HEIGHT = 25
+
+    FIXED = False
+
+    MAX_TYPE = lsystem.FIRST_TREE_TYPE + len(lsystem.SPECIES) - 1
+
+    LAZY_BRANCHES = False
+
+    WATCH = False
+    WATCH_TIME = 5
+
+    RECORD_FILE = None
+    REPLAY_FILE = None
+
+    WRITER_THREAD = False
+    STATS = False
+
+    MAX_CELLS = 250000  #stops a mistyped number of layers (e.g. -l 25) from growing for hours
+    TIME_BUDGET = 0
+
+    #rough cost of growing one cell, used to turn --time-budget into a number of cells
+    CELL_TIME = 15e-6
+    FRAME_TIME = 5e-4  #extra cost per cell of drawing a frame when not in instant mode
+
+    OPTION_DESCS = f"""
+OPTIONS:
+    -h, --help            display help
+        --version         display version
+
+    -s, --seed            seed for the random number generator
+
+    -i, --instant         instant mode: display finished tree immediately
+    -w, --wait            time delay between drawing characters when not in instant mode [default {WAIT_TIME}]
+
+    -c, --branch-chars    string of chars randomly chosen for branches [default "{BRANCH_CHARS}"]
+    -C, --leaf-chars      string of chars randomly chosen for leaves [default "{LEAF_CHARS}"]
+
+    -x, --width           maximum width of the tree [default {WINDOW_WIDTH}]
+    -y, --height          maximum height of the tree [default {WINDOW_HEIGHT}]
+
+    -t, --type            tree type: integer between 0 and {MAX_TYPE} inclusive (4 and up are L-system species) [default random between 0 and 3]
+    -S, --start-len       length of the root branch [default {INITIAL_LEN}]
+    -L, --leaf-len        length of each leaf [default {LEAF_LEN}]
+    -p, --leaf-pool       number of pre-generated leaf clusters to stamp onto branches; 0 => simulate every cluster [default {LEAF_POOL}]
+    -P, --leaf-reuse      number of times a pre-generated leaf cluster is used before being replaced; 0 => never replace [default {LEAF_REUSE}]
+    -l, --layers          number of branch layers: more => more branches [default {NUM_LAYERS}]
+    -a, --angle           mean angle of branches to their parent, in degrees; more => more arched trees [default {ANGLE_MEAN}]
+
+    -f, --fixed-window    do not allow window height to increase when tree grows off screen
+    -b, --lazy-branches   work out the branch counts of fibonacci trees on demand instead of storing them: uses less memory for big trees
+
+    -W, --watch           keep growing new trees until interrupted, holding each finished tree for the given number of seconds [default {WATCH_TIME}]
+
+    -r, --record          record the growth of the tree to the given file instead of animating it (an asciicast if the file ends with .cast)
+    -R, --replay          play back a file saved with --record (use --wait to set the speed)
+
+    -T, --writer-thread   when not in instant mode, write the animation on a separate thread so a slow terminal does not slow down growing the tree
+        --stats           print timing counters when finished
+
+    -m, --max-cells       maximum number of cells the tree is expected to draw; the layers, then the leaf length, are reduced to fit. 0 => no limit [default {MAX_CELLS}]
+    -B, --time-budget     maximum time in seconds to spend growing the tree; the layers, then the leaf length, are reduced to fit, and growing stops when time runs out. 0 => no limit [default {TIME_BUDGET}]
+    """
+
+    SHORT_OPTIONS = {
+        "-h" : "--help",
+        "-i" : "--instant",
+        "-c" : "--branch-chars",
+        "-C" : "--leaf-chars",
+        "-w" : "--wait",
+        "-x" : "--width",
+        "-y" : "--height",
+        "-t" : "--type",
+        "-s" : "--seed",
+        "-S" : "--start-len",
+        "-L" : "--leaf-len",
+        "-p" : "--leaf-pool",
+        "-P" : "--leaf-reuse",
+        "-l" : "--layers",
+        "-a" : "--angle",
+        "-f" : "--fixed-window",
+        "-b" : "--lazy-branches",
+        "-W" : "--watch",
+        "-r" : "--record",
+        "-R" : "--replay",
+        "-T" : "--writer-thread",
+        "-m" : "--max-cells",
+        "-B" : "--time-budget"
+    }
+    
+    def __init__(self):
+        #set the default values
+        self.num_layers = Options.NUM_LAYERS
+        self.initial_len = Options.INITIAL_LEN
+        self.angle_mean = radians(Options.ANGLE_MEAN)
+
+        self.leaf_len = Options.LEAF_LEN
+        self.leaf_pool = Options.LEAF_POOL
+        self.leaf_reuse = Options.LEAF_REUSE
+
+        self.instant = Options.INSTANT
+        self.wait_time = Options.WAIT_TIME
+
+        self.branch_chars = Options.BRANCH_CHARS
+        self.leaf_chars = Options.LEAF_CHARS
+
+        self.user_set_type = False
+        self.type = None  #chosen by finalise(), after the seed has been set
+
+        self.fixed_window = Options.FIXED
+
+        self.lazy_branches = Options.LAZY_BRANCHES
+
+        self.watch = Options.WATCH
+        self.watch_time = Options.WATCH_TIME
+
+        self.record_file = Options.RECORD_FILE
+        self.replay_file = Options.REPLAY_FILE
+
+        self.writer_thread = Options.WRITER_THREAD
+        self.stats = Options.STATS
+
+        self.max_cells = Options.MAX_CELLS
+        self.time_budget = Options.TIME_BUDGET
+
+        #set by finalise() if not given, so the terminal size is only needed if -x or -y are not used
+        self.window_width = None
+        self.window_height = None
+
+    def finalise(self):
+        #fill in the values that depend on the other options (must be called once all options have been set)
+        if self.type is None:
+            self.type = random.randint(0, 3)
+
+        if self.window_width is None or self.window_height is None:
+            default_width, default_height = self.get_default_window()
+
+            if self.window_width is None:
+                self.window_width = default_width
+            if self.window_height is None:
+                self.window_height = default_height
+
+    def get_cell_budget(self):
+        #the number of cells a tree can draw within both budgets (None => no limit)
+        budgets = []
+
+        if self.max_cells > 0:
+            budgets.append(self.max_cells)
+
+        if self.time_budget > 0:
+            cell_time = Options.CELL_TIME
+
+            if not self.instant:
+                cell_time += Options.FRAME_TIME + self.wait_time
+
+            budgets.append(int(self.time_budget / cell_time))
+
+        return min(budgets) if budgets else None
+
+    def get_default_window(self):
+        #ensure the default values fit the current terminal size
+        try:
+            width, height = get_terminal_size()
+        except OSError:
+            #not running in a terminal (e.g. output is piped, or PyBonsai is being used as a library)
+            return Options.WINDOW_WIDTH, Options.WINDOW_HEIGHT
+
+        #check the default values fit the current terminal
+        width = min(width, Options.WINDOW_WIDTH)
+        height = min(height, Options.WINDOW_HEIGHT)
+
+        return width, height
+    
+    def set_option(self, option_name, value):
+        if option_name[1] != "-":
+            #this is a shorthand option name
+            if option_name not in Options.SHORT_OPTIONS:
+                self.show_invalid(option_name)
+
+            option_name = Options.SHORT_OPTIONS[option_name]
+
+        match option_name:
+            case "--layers":
+                self.num_layers = int(value)
+            case "--start-len":
+                self.initial_len = int(value)
+            case "--angle":
+                self.angle_mean = radians(int(value))
+            case "--leaf-len":
+                self.leaf_len = int(value)
+            case "--leaf-pool":
+                self.leaf_pool = int(value)
+            case "--leaf-reuse":
+                self.leaf_reuse = int(value)
+            case "--instant":
+                self.instant = value
+            case "--wait":
+                self.wait_time = float(value)
+            case "--branch-chars":
+                self.branch_chars = parse_string(value)
+            case "--leaf-chars":
+                self.leaf_chars = parse_string(value)
+            case "--type":
+                self.type = int(value)
+                self.user_set_type = True
+
+                if not 0 <= self.type <= Options.MAX_TYPE:
+                    self.show_invalid_type(value)
+            case "--width":
+                self.window_width = int(value)
+            case "--height":
+                self.window_height = int(value)
+            case "--help":
+                self.show_help()
+            case "--version":
+                self.show_version()
+            case "--seed":
+                self.set_seed(int(value))
+            case "--fixed-window":
+                self.fixed_window = True
+            case "--lazy-branches":
+                self.lazy_branches = True
+            case "--watch":
+                self.watch = True
+
+                if value is not True:
+                    self.watch_time = float(value)
+            case "--record":
+                if value is True:
+                    self.show_missing_value(option_name)
+
+                self.record_file = value
+            case "--replay":
+                if value is True:
+                    self.show_missing_value(option_name)
+
+                self.replay_file = value
+            case "--writer-thread":
+                self.writer_thread = True
+            case "--stats":
+                self.stats = True
+            case "--max-cells":
+                self.max_cells = int(value)
+            case "--time-budget":
+                self.time_budget = float(value)
+            case _:
+                self.show_invalid(option_name)
+
+    def show_help(self):
+        print("USEAGE pybonsai [OPTION]...\n")
+        print(DESC)
+        print(Options.OPTION_DESCS)
+
+        quit()
+
+    def show_version(self):
+        print(f"PyBonsai version {VERSION}")
+
+        quit()
+
+    def show_invalid(self, option_name):
+        raise Exception(f"Invalid option: {option_name}. Use pybonsai --help for useage.")
+
+    def show_missing_value(self, option_name):
+        raise Exception(f"Missing value for option: {option_name}. Use pybonsai --help for useage.")
+
+    def show_invalid_type(self, value):
+        raise Exception(f"Invalid tree type: {value}. The type must be an integer between 0 and {Options.MAX_TYPE} inclusive.")
+    
+    def set_seed(self, seed):
+        random.seed(seed)  #the type is chosen after this in finalise(), so the results are repeatable
+
+
+def parse_args():
+    #convert sys.argv into a dictionary in the form {option_name : option_value}
+    args = argv[1:]  #remove the script name
+
+    arg_values = {}
+    for i, x in enumerate(args):
+        if x[0] == "-":
+            value = get_arg_value(args, i)
+
+            is_short = x[1] != "-"
+
+            if is_short and len(x) > 2:
+                #multiple flags have been set at once (e.g. pybonsai -fi)
+                for y in x[1:]:
+                    arg_values[f"-{y}"] = value
+            else:
+                arg_values[x] = value
+
+    return arg_values
+
+
+def get_arg_value(args, inx):
+    value_inx = inx + 1
+
+    if value_inx >= len(args):
+        return True
+    
+    value = args[value_inx]
+    if value[0] == "-":
+        #this is just another argument, not the value itself. Therefore, the argument must have been a flag
+        return True
+    else:
+        return value
+    
+
+def parse_string(string):
+    #remove outside quotation marks (if there are any)
+    if len(string) < 2:
+        return string
+
+    if string[0] == string[-1] == "'":
+        return string[1:-1]
+    elif string[0] == string[-1] == '"':
+        return string[1:-1]
+    else:
+        return string
+    
+
+def get_options(args):
+    options = Options()
+
+    for option_name, value in args.items():
+        options.set_option(option_name, value)
+
+    options.finalise()
+
+    return options
+
+
+def fit_budget(options):
+    from . import tree
+
+    #get the options to grow a tree with: a copy with less detail if the tree (which depends on the tree type) is not expected to fit within the budgets
+    #the given options are never changed, so the detail is always reduced from the values that were asked for
+    max_cells = options.get_cell_budget()
+
+    if max_cells is None:
+        return options
+
+    fitted = copy.copy(options)
+    fitted.num_layers, fitted.leaf_len = tree.fit_budget(options, max_cells)
+
+    return fitted
+
+
+def get_tree(window, options):
+    from . import tree
+
+    options = fit_budget(options)
+
+    root_x = window.layout_width // 2
+
+    root_y = tree.Tree.BOX_HEIGHT + 4
+    root_y = root_y + root_y % 2  #round to nearest even number (odd numbers cause off-by-one errors as chars are twice as tall as they are wide)
+
+    root_pos = (root_x, root_y)
+
+    if options.type == 0:
+        t = tree.ClassicTree(window, root_pos, options)
+    elif options.type == 1:
+        t = tree.FibonacciTree(window, root_pos, options)
+    elif options.type == 2:
+        t = tree.OffsetFibTree(window, root_pos, options)
+    elif options.type == 3:
+        t = tree.RandomOffsetFibTree(window, root_pos, options)
+    else:
+        species = lsystem.SPECIES[options.type - lsystem.FIRST_TREE_TYPE]
+        t = tree.LSystemTree(window, root_pos, options, species)
+
+    return t
+
+
+def get_window(options):
+    from . import draw, tree
+
+    #only store the cells that are drawn if the tree will fill a small part of the window
+    fill_ratio = tree.estimate_cells(fit_budget(options)) / max(1, options.window_width * options.window_height)
+    sparse = fill_ratio < draw.SPARSE_FILL_RATIO
+
+    return draw.TerminalWindow(options.window_width, options.window_height, options, sparse)
+
+
+def watch(window, options):
+    #grow a new tree every options.watch_time seconds, reusing the same window (and its buffer) for each one
+    num_trees = 0
+    total_grow_time = 0
+
+    try:
+        while True:
+            if not options.user_set_type:
+                options.type = random.randint(0, 3)
+
+            start_time = perf_counter()
+
+            t = get_tree(window, options)
+            t.draw()
+
+            total_grow_time += perf_counter() - start_time
+            num_trees += 1
+
+            window.draw()
+            window.hold(options.watch_time)
+
+            window.reset()
+    except KeyboardInterrupt:
+        window.reset_cursor()
+
+        mean_grow_time = total_grow_time / max(1, num_trees) * 1000
+        mean_frame_time = window.total_frame_time / max(1, window.num_frames) * 1000
+
+        print(f"grew {num_trees} trees (mean {mean_grow_time:.1f}ms), drew {window.num_frames} frames (mean {mean_frame_time:.1f}ms)")
+
+
+def record_tree(window, options):
+    from . import record
+
+    #grow the tree without animating it, but record each character as it would have been drawn
+    window.recorder = record.Recorder()
+    options.instant = False
+
+    t = get_tree(window, options)
+    t.draw()
+
+    window.recorder.save(options.record_file, window.width, window.height)
+
+    window.draw()
+    window.reset_cursor()
+
+
+def grow_threaded(window, options):
+    from . import writer
+
+    #grow the tree on this thread, while a FrameWriter draws the animation on another
+    frame_writer = writer.FrameWriter(window.width, window.height, options)
+    window.writer = frame_writer
+
+    watch_resize(frame_writer.window)
+
+    frame_writer.start()
+
+    t = get_tree(window, options)
+    t.draw()
+
+    frame_writer.stop()
+
+    frame_writer.window.draw()
+    frame_writer.window.reset_cursor()
+
+    if options.stats:
+        print(frame_writer.summary())
+
+
+def watch_resize(window):
+    #re-render the tree when the terminal is resized (SIGWINCH does not exist on Windows)
+    import signal
+
+    if hasattr(signal, "SIGWINCH"):
+        signal.signal(signal.SIGWINCH, window.on_resize)
+
+
+def main():
+    args = parse_args()
+    options = get_options(args)
+
+    if options.replay_file is not None:
+        from . import record
+
+        record.replay(options.replay_file, options)
+        return
+
+    window = get_window(options)
+
+    if options.record_file is not None:
+        record_tree(window, options)
+        return
+
+    if options.writer_thread and not options.instant and not options.watch:
+        grow_threaded(window, options)
+        return
+
+    if options.watch or not options.instant:
+        watch_resize(window)
+
+    if options.watch:
+        watch(window, options)
+        return
+
+    t = get_tree(window, options)
+
+    t.draw()
+    window.draw()
+    window.reset_cursor()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+from . import draw
+
+import sys
+import json
+from time import sleep, perf_counter
+
+
+LOG_VERSION = 1
+CAST_VERSION = 2  #asciicast v2 (https://docs.asciinema.org/manual/asciicast/v2/)
+
+FRAME_TIME = 1 / 30  #writes are batched into frames of this length when played back
+REPLAY_CHAR_TIME = 0.002  #time per character when played back with no --wait
+
+
+class Recorder:
+    #records the cells set while a tree grows, so the animation can be played back without growing the tree again
+    def __init__(self):
+        #(rows up from the bottom, column, char, colour, is end of frame)
+        #a frame ends after each set_char_wait() call - set_char_instant() calls are shown with the next frame
+        self.events = []
+
+    def add(self, row, col, char, colour):
+        self.events.append((row, col, char, tuple(colour), False))
+
+    def end_frame(self):
+        if len(self.events) > 0:
+            self.events[-1] = self.events[-1][:4] + (True,)
+
+    def save(self, path, width, height):
+        if path.endswith(".cast"):
+            save_cast(path, width, height, self.events)
+        else:
+            save_log(path, width, height, self.events)
+
+
+def save_log(path, width, height, events):
+    #one line per cell: "row col rrggbb end_of_frame char" (the char goes last as it may be a space)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(json.dumps({"version" : LOG_VERSION, "width" : width, "height" : height}) + "\n")
+
+        for row, col, char, colour, frame_end in events:
+            r, g, b = colour
+            file.write(f"{row} {col} {r:02x}{g:02x}{b:02x} {int(frame_end)} {char}\n")
+
+
+def load_log(path):
+    with open(path, encoding="utf-8") as file:
+        header = json.loads(file.readline())
+
+        if header.get("version") != LOG_VERSION:
+            raise Exception(f"Invalid recording: {path}")
+
+        events = []
+        for line in file:
+            row, col, colour, frame_end, char = line.rstrip("\n").split(" ", 4)
+            colour = (int(colour[0:2], 16), int(colour[2:4], 16), int(colour[4:6], 16))
+
+            events.append((int(row), int(col), char, colour, frame_end == "1"))
+
+    return header["width"], header["height"], events
+
+
+def encode_event(row, col, char, colour, width, height):
+    #move from the top left of the frame to the cell, write it and move back
+    x = height - 1 - row
+    y = col
+
+    if not 0 <= x < height or not 0 <= y < width:
+        return ""
+
+    down = f"\033[{x}B" if x > 0 else ""
+    right = f"\033[{y}C" if y > 0 else ""
+    up = f"\033[{x}A" if x > 0 else ""
+
+    return f"{down}{right}{draw.colour_char(char, colour[0], colour[1], colour[2])}\r{up}"
+
+
+def get_frames(width, height, events, char_time):
+    #group the encoded events into (time, output) frames, with each end of frame taking char_time
+    start = draw.HIDE_CURSOR + "\n" * height + f"\033[{height}A"  #make space for the tree and go back to the top
+    frames = [(0, [start])]
+
+    time = 0
+    for row, col, char, colour, frame_end in events:
+        frame_time = int(time / FRAME_TIME) * FRAME_TIME
+
+        if frame_time > frames[-1][0]:
+            frames.append((frame_time, []))
+
+        frames[-1][1].append(encode_event(row, col, char, colour, width, height))
+
+        if frame_end:
+            time += char_time
+
+    frames.append((time, [f"\033[{height}B", draw.SHOW_CURSOR]))  #leave the cursor below the tree
+
+    return [(frame_time, "".join(output)) for frame_time, output in frames]
+
+
+def save_cast(path, width, height, events):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(json.dumps({"version" : CAST_VERSION, "width" : width, "height" : height}) + "\n")
+
+        for frame_time, output in get_frames(width, height, events, REPLAY_CHAR_TIME):
+            file.write(json.dumps([round(frame_time, 6), "o", output]) + "\n")
+
+
+def load_cast(path):
+    with open(path, encoding="utf-8") as file:
+        header = json.loads(file.readline())
+
+        if header.get("version") != CAST_VERSION:
+            raise Exception(f"Invalid asciicast: {path}")
+
+        frames = []
+        for line in file:
+            frame_time, event_type, output = json.loads(line)
+
+            if event_type == "o":
+                frames.append((frame_time, output))
+
+    return frames
+
+
+def replay(path, options):
+    #play back a recording: this only writes the recorded output, no tree is grown
+    if path.endswith(".cast"):
+        frames = load_cast(path)
+    else:
+        width, height, events = load_log(path)
+        frames = get_frames(width, height, events, options.wait_time if options.wait_time > 0 else REPLAY_CHAR_TIME)
+
+    start_time = perf_counter()
+
+    for frame_time, output in frames:
+        delay = start_time + frame_time - perf_counter()
+
+        if delay > 0:
+            sleep(delay)
+
+        sys.stdout.write(output)
+        sys.stdout.flush()
@@ -1,6 +1,10 @@
 import math
-import utils
+import copy
+from . import draw
+from . import utils
 import random
+from . import lsystem
+from time import perf_counter
 
 
 class Tree:
@@ -28,8 +32,15 @@ class Tree:
 
         self.box_top_width = self.get_box_width()
 
+        #wall clock time after which no more branches are grown (None => no time limit)
+        self.deadline = perf_counter() + options.time_budget if options.time_budget > 0 else None
+
+    def out_of_time(self):
+        #checked before each branch, so a tree that runs over its time budget stops growing but is still drawn
+        return self.deadline is not None and perf_counter() > self.deadline
+
     def get_box_width(self):
-        width = min(self.window.width // 3, Tree.MAX_TOP_WIDTH)
+        width = min(self.window.layout_width // 3, Tree.MAX_TOP_WIDTH)
 
         if width % 2 == 0:
             width += 1  #width should be odd to allow tree to go in middle
@@ -163,6 +174,9 @@ class ClassicTree(RecursiveTree):
         super().__init__(window, root_pos, options)
 
     def draw_branch(self, x, y, layer, length, width, theta):
+        if self.out_of_time():
+            return
+
         if layer >= self.options.num_layers:
             leaves = Leaves(self.window, (x, y), self.options)
             leaves.draw()
@@ -205,18 +219,31 @@ class ClassicTree(RecursiveTree):
 
 class FibonacciTree(RecursiveTree):
     #trees with a fibonacci number of branches on each layer
+    FIB_CACHE = {}  #number of layers => fibonacci numbers
+
     def __init__(self, window, root_pos, options):
         super().__init__(window, root_pos, options)
 
-        self.fib = self.fib_nums()
-        self.branch_nums = self.generate_branch_nums()
+        self.fib = FibonacciTree.fib_nums(self.options.num_layers)
+
+        if self.options.lazy_branches:
+            self.branch_nums = LazyBranchNums(self.fib, random.getrandbits(64))
+        else:
+            self.branch_nums = self.generate_branch_nums()
+
+    @staticmethod
+    def fib_nums(num_layers):
+        #the sequence only depends on the number of layers, so it is shared between trees (e.g. in watch mode)
+        if num_layers in FibonacciTree.FIB_CACHE:
+            return FibonacciTree.FIB_CACHE[num_layers]
 
-    def fib_nums(self):
         fib = [1, 1]
 
-        for _ in range(self.options.num_layers):
+        for _ in range(num_layers):
             fib.append(fib[-1] + fib[-2])
 
+        FibonacciTree.FIB_CACHE[num_layers] = fib
+
         return fib
     
     def generate_branch_nums(self):
@@ -237,7 +264,16 @@ class FibonacciTree(RecursiveTree):
 
         return branch_nums
     
+    def get_num_branches(self, layer_inx, branch_inx):
+        if self.options.lazy_branches:
+            return self.branch_nums.get(layer_inx, branch_inx)
+        else:
+            return self.branch_nums[layer_inx][branch_inx]
+    
     def draw_branch(self, x, y, layer_inx, branch_inx, length, width, theta):
+        if self.out_of_time():
+            return
+
         if layer_inx > self.options.num_layers:
             leaf = Leaves(self.window, (x, y), self.options)
             leaf.draw()
@@ -253,7 +289,7 @@ class FibonacciTree(RecursiveTree):
     def draw_end_branches(self, start_x, start_y, layer_inx, branch_inx, length, width, theta):
         #draw the child branches off of the end of the parent branch
         sign = 1
-        num_branches = self.branch_nums[layer_inx][branch_inx]
+        num_branches = self.get_num_branches(layer_inx, branch_inx)
         new_width = max(1, width - 1)
 
         x, y = self.get_end_coords(start_x, start_y, length, theta)
@@ -277,6 +313,45 @@ class FibonacciTree(RecursiveTree):
         self.draw_branch(self.root_x, self.root_y, 1, 0, self.options.initial_len, initial_width, initial_angle)
 
 
+class LazyBranchNums:
+    #alternative to FibonacciTree.generate_branch_nums() that works out the number of child branches of any parent on demand
+    #the counts are a function of (layer, index, seed) only, so memory use is O(layers) and subtrees can be generated independently
+    def __init__(self, fib, seed):
+        self.fib = fib
+        self.seed = seed
+
+        self.permutations = {}  #layer index => (a, b) of the permutation used to shuffle that layer
+
+    def get_permutation(self, layer_inx, num_parents):
+        if layer_inx not in self.permutations:
+            a = utils.hash_ints(self.seed, layer_inx, 0) % num_parents
+            b = utils.hash_ints(self.seed, layer_inx, 1) % num_parents
+
+            #p -> (a * p + b) % num_parents only shuffles the parents if a and num_parents are coprime
+            while math.gcd(a, num_parents) != 1:
+                a = (a + 1) % num_parents
+
+            self.permutations[layer_inx] = (a, b)
+
+        return self.permutations[layer_inx]
+
+    def get(self, layer_inx, branch_inx):
+        if layer_inx == 0:
+            return 1
+
+        num_parents = self.fib[layer_inx]
+        num_branches = self.fib[layer_inx + 1]
+
+        base = num_branches // num_parents
+        diff = num_branches - base * num_parents
+
+        #exactly diff parents (chosen by the shuffle) get an extra branch, as in generate_branch_nums()
+        a, b = self.get_permutation(layer_inx, num_parents)
+        shuffled_inx = (a * branch_inx + b) % num_parents
+
+        return base + 1 if shuffled_inx < diff else base
+
+
 class OffsetFibTree(FibonacciTree):
     #similar to fibonacci tree, but branches grow from the middle of the parent branch
     def __init__(self, window, root_pos, options):
@@ -284,7 +359,7 @@ class OffsetFibTree(FibonacciTree):
 
     def draw_end_branches(self, start_x, start_y, layer_inx, branch_inx, length, width, theta):
         sign = 1
-        num_branches = self.branch_nums[layer_inx][branch_inx]
+        num_branches = self.get_num_branches(layer_inx, branch_inx)
 
         step = length / num_branches if num_branches != 0 else 0
 
@@ -314,7 +389,7 @@ class RandomOffsetFibTree(FibonacciTree):
 
     def draw_end_branches(self, start_x, start_y, layer_inx, branch_inx, length, width, theta):
         sign = 1
-        num_branches = self.branch_nums[layer_inx][branch_inx]
+        num_branches = self.get_num_branches(layer_inx, branch_inx)
 
         new_width = max(1, width - 1)
         new_length = length * ClassicTree.LEN_SCALE
@@ -347,33 +422,238 @@ class RandomOffsetFibTree(FibonacciTree):
             leaves.draw()
 
 
+class LSystemTree(RecursiveTree):
+    #trees defined as data by an L-system grammar (see lsystem.SPECIES), drawn by a turtle as the grammar is expanded
+    def __init__(self, window, root_pos, options, species):
+        super().__init__(window, root_pos, options)
+
+        self.species = species
+        self.lsystem = lsystem.get_lsystem(species, options)
+
+    def draw_turtle(self, initial_width, initial_angle):
+        step = self.options.initial_len * self.species["len_scale"] ** self.lsystem.iterations
+        angle_mean = math.radians(self.species["angle"])
+
+        x, y = self.root_x, self.root_y
+        theta = initial_angle
+
+        stack = []  #(x, y, theta) saved by each [
+        forward_len = 0  #consecutive F's are drawn as a single line
+
+        for symbol in self.lsystem.expand():
+            if self.out_of_time():
+                return
+
+            if symbol == lsystem.FORWARD:
+                forward_len += step
+                continue
+
+            if forward_len > 0:
+                end_x, end_y = self.get_end_coords(x, y, forward_len, theta)
+                width = max(1, initial_width - len(stack))
+
+                self.window.draw_line((x, y), (end_x, end_y), LSystemTree.BRANCH_COLOUR, width)
+
+                x, y = end_x, end_y
+                forward_len = 0
+
+            if symbol == lsystem.TURN_RIGHT:
+                theta += random.normalvariate(angle_mean, LSystemTree.ANGLE_STD_DEV)
+            elif symbol == lsystem.TURN_LEFT:
+                theta -= random.normalvariate(angle_mean, LSystemTree.ANGLE_STD_DEV)
+            elif symbol == lsystem.PUSH:
+                stack.append((x, y, theta))
+            elif symbol == lsystem.POP:
+                x, y, theta = stack.pop()
+            elif symbol in self.species["leaf_symbols"]:
+                leaves = Leaves(self.window, (x, y), self.options)
+                leaves.draw()
+
+        if forward_len > 0:
+            end_x, end_y = self.get_end_coords(x, y, forward_len, theta)
+            self.window.draw_line((x, y), (end_x, end_y), LSystemTree.BRANCH_COLOUR, max(1, initial_width))
+
+    def draw(self):
+        initial_width, initial_angle = self.get_initial_params()
+
+        self.draw_box()
+        self.draw_tree_base(initial_width)
+
+        self.draw_turtle(initial_width, initial_angle)
+
+
 class Leaves:
     NUM_LEAVES = 4
 
-    def __init__(self, window, branch_end, options):
+    def __init__(self, window, branch_end, options, rng=None):
         self.window = window
         self.branch_x, self.branch_y = branch_end
         self.options = options
 
-    def draw(self):
+        self.rng = rng if rng is not None else window.rng
+
+    def get_cells(self):
+        #simulate the leaves, yielding (x, y, char, colour) for each leaf character in cartesian coords
         g = utils.Vector(0, -1)
 
         for _ in range(Leaves.NUM_LEAVES):
-            vel = utils.Vector(random.uniform(-1, 1), random.uniform(-1, 1))  #random starting velocity for the leaves to step along
+            vel = utils.Vector(self.rng.uniform(-1, 1), self.rng.uniform(-1, 1))  #random starting velocity for the leaves to step along
             vel.normalise()
             pos = utils.Vector(self.branch_x, self.branch_y)
 
             for i in range(self.options.leaf_len):
                 pos += vel
 
-                colour = (0, random.randint(75, 255), 0)
-                char = random.choice(self.options.leaf_chars)
+                colour = (0, self.rng.randint(75, 255), 0)
+                char = self.rng.choice(self.options.leaf_chars)
 
-                if self.options.instant:
-                    self.window.set_char_instant(pos.x, pos.y, char, colour, False)
-                else:
-                    self.window.set_char_wait(pos.x, pos.y, char, colour, False, self.options.wait_time)
+                yield pos.x, pos.y, char, colour
 
                 #make the leaves droop downwards by adding some gravity force
                 weight = i / self.options.leaf_len
-                vel += g * weight
\ No newline at end of file
+                vel += g * weight
+
+    def draw(self):
+        if self.options.leaf_pool > 0:
+            LeafSprites.get_pool(self.window, self.options).stamp(self.window, self.branch_x, self.branch_y, self.options)
+            return
+
+        for x, y, char, colour in self.get_cells():
+            if self.options.instant:
+                self.window.set_char_instant(x, y, char, colour, False)
+            else:
+                self.window.set_char_wait(x, y, char, colour, False, self.options.wait_time)
+
+
+class LeafSprites:
+    #a pool of pre-generated leaf clusters that are stamped onto the window, instead of simulating the leaves on every branch
+    #each sprite is a list of (row offset, column offset, index in leaf_chars, green value) from the end of the branch
+    def __init__(self, options, seed):
+        #the pool is shared by the trees drawn in a window, so these options are only used for generating sprites (leaf_len and leaf_chars)
+        #everything else comes from the options of the tree being drawn, which are passed to stamp()
+        self.options = options
+        self.key = (options.leaf_len, options.leaf_chars)
+        self.rng = utils.BulkRandom(seed)
+
+        self.sprites = [self.make_sprite() for _ in range(options.leaf_pool)]
+        self.uses = [0 for _ in range(options.leaf_pool)]
+
+    @staticmethod
+    def get_pool(window, options):
+        #each window keeps its own pool (reused by every tree drawn in it, e.g. in watch mode), seeded from the window's random stream
+        #so the same seed always gives the same tree
+        pool = window.leaf_sprites
+
+        if pool is None or pool.key != (options.leaf_len, options.leaf_chars) or len(pool.sprites) != options.leaf_pool:
+            seed = window.rng.next_value() << 32 | window.rng.next_value()
+            window.leaf_sprites = LeafSprites(options, seed)
+
+        return window.leaf_sprites
+
+    def make_sprite(self):
+        leaves = Leaves(None, (0, 0), self.options, self.rng)
+
+        sprite = []
+        for x, y, char, colour in leaves.get_cells():
+            d_row = -round(y / draw.TerminalWindow.CHAR_HEIGHT)
+            d_col = round(x / draw.TerminalWindow.CHAR_WIDTH)
+
+            sprite.append((d_row, d_col, self.options.leaf_chars.index(char), colour[1]))
+
+        return sprite
+
+    def choose_sprite(self, options):
+        inx = random.randrange(len(self.sprites))
+        sprite = self.sprites[inx]
+
+        self.uses[inx] += 1
+
+        if options.leaf_reuse > 0 and self.uses[inx] >= options.leaf_reuse:
+            #this sprite has been used enough, so replace it with a new one for the next time (more variety, but slower)
+            self.sprites[inx] = self.make_sprite()
+            self.uses[inx] = 0
+
+        return sprite
+
+    def stamp(self, window, branch_x, branch_y, options):
+        inx1, inx2 = window.plane_to_screen(branch_x, branch_y)
+
+        for d_row, d_col, char_inx, green in self.choose_sprite(options):
+            char = options.leaf_chars[char_inx]
+            colour = (0, green, 0)
+
+            if options.instant:
+                window.set_char_instant(inx1 + d_row, inx2 + d_col, char, colour, True)
+            else:
+                window.set_char_wait(inx1 + d_row, inx2 + d_col, char, colour, True, options.wait_time)
+
+
+def estimate_cells(options):
+    #rough (upper) estimate of the number of cells a tree will draw, without growing it
+    if options.type >= lsystem.FIRST_TREE_TYPE:
+        return estimate_lsystem_cells(options, lsystem.SPECIES[options.type - lsystem.FIRST_TREE_TYPE])
+
+    if options.type == 0:
+        #branches are drawn on layers 1 to num_layers - 1, and each has MEAN_BRANCHES children on average
+        layer_counts = [ClassicTree.MEAN_BRANCHES ** i for i in range(options.num_layers - 1)]
+        num_tips = ClassicTree.MEAN_BRANCHES ** (options.num_layers - 1)
+    else:
+        #layer n has the nth fibonacci number of branches
+        fib = FibonacciTree.fib_nums(options.num_layers)
+
+        layer_counts = fib[1 : options.num_layers + 1]
+        num_tips = fib[options.num_layers + 1]
+
+    initial_width = min(RecursiveTree.MAX_INITIAL_WIDTH, max(0, options.initial_len // 5))
+
+    num_cells = Tree.MAX_TOP_WIDTH * (Tree.BOX_HEIGHT + 1)
+    for i, count in enumerate(layer_counts):
+        length = options.initial_len * RecursiveTree.LEN_SCALE ** i
+        width = max(1, initial_width - i) if initial_width > 0 else 0
+
+        num_cells += count * math.ceil(length) * width
+
+    num_cells += num_tips * Leaves.NUM_LEAVES * options.leaf_len
+
+    return num_cells
+
+
+def estimate_lsystem_cells(options, species):
+    system = lsystem.get_lsystem(species, options)
+    counts = system.count_symbols()
+
+    step = options.initial_len * species["len_scale"] ** system.iterations
+    initial_width = min(RecursiveTree.MAX_INITIAL_WIDTH, max(1, options.initial_len // 5))
+
+    num_cells = Tree.MAX_TOP_WIDTH * (Tree.BOX_HEIGHT + 1)
+    num_cells += counts.get(lsystem.FORWARD, 0) * math.ceil(step) * initial_width
+    num_cells += sum(counts.get(symbol, 0) for symbol in species["leaf_symbols"]) * Leaves.NUM_LEAVES * options.leaf_len
+
+    return round(num_cells)
+
+
+def fit_budget(options, max_cells):
+    #find the most detailed (num_layers, leaf_len), no more than the ones requested, whose estimated number of cells fits within max_cells
+    #the depth is reduced first, as the number of branches grows exponentially with it, then the leaves are shortened
+    trial = copy.copy(options)
+    max_layers = options.num_layers
+
+    if options.type >= lsystem.FIRST_TREE_TYPE:
+        #the grammar is never expanded more times than the species allows, so extra layers make no difference to the size
+        max_layers = min(max_layers, lsystem.SPECIES[options.type - lsystem.FIRST_TREE_TYPE]["iterations"])
+
+    #count the layers up rather than down, so the size of a huge (e.g. mistyped) number of layers is never estimated
+    trial.num_layers = min(1, max_layers)
+    while trial.num_layers < max_layers:
+        trial.num_layers += 1
+
+        if estimate_cells(trial) > max_cells:
+            trial.num_layers -= 1
+            break
+    else:
+        trial.num_layers = options.num_layers
+
+    while trial.leaf_len > 1 and estimate_cells(trial) > max_cells:
+        trial.leaf_len -= 1
+
+    return trial.num_layers, trial.leaf_len
@@ -0,0 +1,138 @@
+import sys
+import math
+import random
+from array import array
+
+
+class Line:
+    #line in form y = mx + c
+    def __init__(self):
+        self.start = None
+        self.end = None
+
+        self.m = None
+        self.c = None
+
+        self.is_vertical = False
+
+    def get_y(self, x):
+        if not self.is_vertical:
+            return self.m * x + self.c
+        
+    def get_x(self, y):
+        if self.is_vertical:
+            return self.c
+        elif self.m != 0:
+            return (y - self.c) / self.m
+
+    def set_end_points(self, start, end):
+        self.start = start
+        self.end = end
+
+        if self.start[0] == self.end[0]:
+            self.is_vertical = True
+            self.m = None
+            self.c = self.start[0]
+        else:
+            self.m = (self.start[1] - self.end[1]) / (self.start[0] - self.end[0])
+            self.c = self.start[1] - self.m * self.start[0]
+
+    def set_gradient(self, m, point):
+        self.m = m
+        self.c = point[1] - m * point[0]
+    
+    def get_theta(self):
+        #get angle above x axis
+        if self.is_vertical:
+            return math.pi / 2
+        else:
+            return math.atan(self.m)
+
+
+class Vector:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    mag = lambda self: (self.x**2 + self.y**2)**0.5
+
+    def __iadd__(self, other_vec):
+        return Vector(self.x + other_vec.x, self.y + other_vec.y)
+    
+    def __mul__(self, scalar):
+        return Vector(self.x * scalar, self.y * scalar)
+    
+    def normalise(self):
+        m = self.mag()
+
+        self.x /= m
+        self.y /= m
+
+MASK_64 = (1 << 64) - 1
+
+
+def hash_ints(*values):
+    #counter based hash: the same values always give the same (well mixed) 64 bit result, with no state carried between calls
+    h = 0
+    for value in values:
+        #splitmix64 finaliser (https://prng.di.unimi.it/splitmix64.c)
+        h = (h + value + 0x9E3779B97F4A7C15) & MASK_64
+        h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+        h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & MASK_64
+        h ^= h >> 31
+
+    return h
+
+
+class BulkRandom:
+    #random numbers for the per cell choices, which are made far more often than any others
+    #the numbers are drawn from their own generator in large batches, so each one is just read from a buffer
+    BATCH_SIZE = 4096
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.values = iter(())  #iterator over the current batch of random 32 bit integers (a new batch is made when it runs out)
+
+    def new_batch(self):
+        bits = self.rng.getrandbits(32 * BulkRandom.BATCH_SIZE)
+
+        batch = array("I", bits.to_bytes(4 * BulkRandom.BATCH_SIZE, "little"))
+        if sys.byteorder == "big":
+            batch.byteswap()  #keep the same values (and so the same trees) on every platform
+
+        #the array's own iterator is used rather than a generator or an index, as it is the cheapest way to read each value
+        self.values = iter(batch)
+
+        return next(self.values)
+
+    def next_value(self):
+        #raw random 32 bit integer: comparing it against a precomputed threshold is cheaper than calling uniform(0, 1)
+        try:
+            return next(self.values)
+        except StopIteration:
+            return self.new_batch()
+
+    def uniform(self, lower, upper):
+        try:
+            value = next(self.values)
+        except StopIteration:
+            value = self.new_batch()
+
+        return lower + (upper - lower) * value / 2**32
+
+    def randint(self, lower, upper):
+        #random integer in [lower, upper] (the small bias is not noticeable for the ranges used here)
+        try:
+            value = next(self.values)
+        except StopIteration:
+            value = self.new_batch()
+
+        return lower + (value * (upper - lower + 1) >> 32)
+
+    def choice(self, seq):
+        try:
+            value = next(self.values)
+        except StopIteration:
+            value = self.new_batch()
+
+        return seq[value * len(seq) >> 32]
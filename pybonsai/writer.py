@@ -0,0 +1,157 @@
+from . import draw
+
+import queue
+import threading
+from time import sleep, perf_counter
+
+
+QUEUE_SIZE = 4096  #maximum number of frames waiting to be written (growing the tree blocks when it is full)
+MAX_MERGE = 256  #maximum number of frames merged into one when the writer is behind
+PUT_TIMEOUT = 0.1  #how often a blocked push checks that the writer thread is still running
+
+
+class FrameWriter:
+    #writes the animation on its own thread, so a slow terminal does not hold up growing the tree and vice versa
+    #the tree pushes cell updates onto a queue, one frame (the cells set since the last set_char_wait()) at a time,
+    #and the writer applies them to its own copy of the window and draws them
+    def __init__(self, width, height, options):
+        self.window = draw.TerminalWindow(width, height, options, grows_trees=False)  #only shows the cells pushed to it
+        self.options = options
+
+        self.frames = queue.Queue(QUEUE_SIZE)
+        self.pending = []  #cell updates of the frame the tree is currently growing
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+        self.error = None  #exception that stopped the writer thread (e.g. BrokenPipeError), re-raised on the growing thread
+
+        #counters
+        self.num_updates = 0
+        self.num_frames = 0
+        self.num_merged = 0  #frames that were written together with an earlier frame because the writer was behind
+        self.num_blocked = 0  #times growing the tree had to wait for the writer because the queue was full
+        self.num_sent = 0  #frames sent to the writer
+        self.max_depth = 0
+        self.total_depth = 0
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        #wait for every update to be written
+        if len(self.pending) > 0:
+            self.end_frame()
+
+        self.put(None)
+        self.thread.join()
+
+        self.check_error()
+
+    def check_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def put(self, item):
+        #block until there is room in the queue, but give up if the writer thread has stopped (otherwise nothing would empty the queue)
+        while True:
+            self.check_error()
+
+            if not self.thread.is_alive():
+                raise RuntimeError("the writer thread has stopped")
+
+            try:
+                self.frames.put(item, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+
+    def push(self, row, col, char, colour):
+        #row is the number of rows up from the bottom, so it does not change when the window grows
+        self.pending.append((row, col, char, colour))
+        self.num_updates += 1
+
+    def end_frame(self):
+        #the tree has set a cell that the animation should show (as Recorder.end_frame()), so send the frame to the writer
+        frame = self.pending
+        self.pending = []
+
+        depth = self.frames.qsize()
+
+        self.num_sent += 1
+        self.total_depth += depth
+        self.max_depth = max(self.max_depth, depth)
+
+        self.check_error()
+
+        try:
+            self.frames.put_nowait(frame)
+        except queue.Full:
+            self.num_blocked += 1
+            self.put(frame)
+
+    def apply(self, update):
+        row, col, char, colour = update
+        self.window.set_char_instant(self.window.layout_height - 1 - row, col, char, colour, True)
+
+    def run(self):
+        try:
+            self.write_frames()
+        except Exception as error:
+            self.error = error
+
+    def write_frames(self):
+        #show one frame every wait_time, as the single threaded animation does
+        #frames are only merged when writing to the terminal has made the writer fall behind this schedule
+        wait_time = self.options.wait_time
+        next_time = perf_counter()  #when the next frame is due to be shown
+        write_late = 0  #how far behind the schedule the terminal writes have left the writer
+
+        finished = False
+
+        while not finished:
+            try:
+                frames = [self.frames.get_nowait()]
+            except queue.Empty:
+                #the writer has been waiting for the tree to grow, so it is not behind
+                frames = [self.frames.get()]
+                write_late = 0
+
+            delay = next_time - perf_counter()
+            if delay > 0:
+                sleep(delay)
+
+            #catch up by merging the frames that the terminal writes made the writer late for
+            #(with no wait_time there is no schedule to fall behind, so every frame is shown as in the single threaded animation)
+            while wait_time > 0 and write_late >= wait_time and frames[-1] is not None and len(frames) < MAX_MERGE:
+                try:
+                    frames.append(self.frames.get_nowait())
+                except queue.Empty:
+                    break
+
+                write_late -= wait_time
+
+            #any other delay (e.g. sleep() overshooting, or waiting for the other thread) just moves the schedule on
+            next_time = perf_counter() + wait_time
+
+            if None in frames:
+                finished = True
+                frames = frames[:frames.index(None)]
+
+            if len(frames) == 0:
+                break
+
+            for frame in frames:
+                for update in frame:
+                    self.apply(update)
+
+            self.num_merged += len(frames) - 1
+
+            self.window.check_resize()
+            self.window.draw()
+            self.num_frames += 1
+
+            write_late += max(0, perf_counter() - next_time)
+
+    def summary(self):
+        mean_depth = self.total_depth / max(1, self.num_sent)
+
+        return f"wrote {self.num_updates} updates in {self.num_frames} frames ({self.num_merged} frames merged), queue depth mean {mean_depth:.1f} max {self.max_depth}, blocked {self.num_blocked} times"